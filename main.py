@@ -1,35 +1,105 @@
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
 from shutil import rmtree, copyfile
 
 INPUT_DIRECTORY_PATH = Path(r"C:\Users\Andrew\Downloads\JDownloader")
 OUTPUT_DIRECTORY_PATH = INPUT_DIRECTORY_PATH / "output"
 MAX_FILENAME_LENGTH = 55
+MAX_COPY_WORKERS = 8
+MAX_PENDING_COPIES = MAX_COPY_WORKERS * 4
+PROGRESS_BATCH_SIZE = 256
 
 
 def main():
     setup_directories()
+    output_prefix = os.path.join(OUTPUT_DIRECTORY_PATH, "")
 
-    for file_path in INPUT_DIRECTORY_PATH.iterdir():
-        if file_path.is_file():
-            source_file_path = INPUT_DIRECTORY_PATH / file_path.name
-            output_file_path = truncate_file(source_file_path)
-            print(f"{source_file_path} => {output_file_path}")
-            copyfile(source_file_path, output_file_path)
+    progress_lines = []
+    used_file_names = set()
+    with ThreadPoolExecutor(max_workers=MAX_COPY_WORKERS) as executor:
+        pending = {}
+        try:
+            with os.scandir(INPUT_DIRECTORY_PATH) as entries:
+                for entry in entries:
+                    # Symlinks are skipped so the check is answered from the
+                    # directory entry's type without a stat call.
+                    if entry.is_file(follow_symlinks=False):
+                        source_file_path = entry.path
+                        output_file_path = output_prefix + unique_file_name(
+                            entry.name, used_file_names
+                        )
+                        future = executor.submit(
+                            copyfile, source_file_path, output_file_path
+                        )
+                        pending[future] = (source_file_path, output_file_path)
+                        if len(pending) >= MAX_PENDING_COPIES:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            collect_copies(done, pending, progress_lines)
+            collect_copies(as_completed(list(pending)), pending, progress_lines)
+        except BaseException:
+            # Stop at the first failure or interrupt: copies that have not
+            # started yet are cancelled instead of being drained on exit.
+            executor.shutdown(wait=False, cancel_futures=True)
+            collect_finished_copies(pending, progress_lines)
+            raise
+        finally:
+            flush_progress(progress_lines)
+
+
+def collect_copies(futures, pending, progress_lines):
+    for future in futures:
+        future.result()
+        source_file_path, output_file_path = pending.pop(future)
+        progress_lines.append(f"{source_file_path} => {output_file_path}")
+        if len(progress_lines) >= PROGRESS_BATCH_SIZE:
+            flush_progress(progress_lines)
+
+
+def collect_finished_copies(pending, progress_lines):
+    # Wait for copies that were already running and report the ones that
+    # landed, so the output matches what is on disk. Futures that can still
+    # be cancelled are left out because wait() is never notified about them.
+    done, _ = wait([future for future in pending if not future.cancel()])
+    for future in done:
+        if future.exception() is None:
+            source_file_path, output_file_path = pending.pop(future)
+            progress_lines.append(f"{source_file_path} => {output_file_path}")
+
+
+def flush_progress(progress_lines):
+    if progress_lines:
+        sys.stdout.write("\n".join(progress_lines) + "\n")
+        sys.stdout.flush()
+        progress_lines.clear()
 
 
 def setup_directories():
-    Path(OUTPUT_DIRECTORY_PATH).mkdir(parents=True, exist_ok=True)
-
-
-def truncate_file(source_file_path):
-    if len(source_file_path.name) > MAX_FILENAME_LENGTH:
-        new_file_name = (
-            source_file_path.stem[:MAX_FILENAME_LENGTH] + source_file_path.suffix
-        )
-        output_file_name = OUTPUT_DIRECTORY_PATH / new_file_name
-    else:
-        output_file_name = source_file_path
-    return output_file_name
+    os.makedirs(OUTPUT_DIRECTORY_PATH, exist_ok=True)
+
+
+def unique_file_name(file_name, used_file_names):
+    # Copies run concurrently, so two sources truncated to the same name
+    # would write into one output file at once. Later ones get a counter.
+    unique_name = truncate_file_name(file_name)
+    counter = 1
+    while os.path.normcase(unique_name) in used_file_names:
+        unique_name = truncate_file_name(file_name, f"_{counter}")
+        counter += 1
+    used_file_names.add(os.path.normcase(unique_name))
+    return unique_name
+
+
+def truncate_file_name(file_name, tag=""):
+    if not tag and len(file_name) <= MAX_FILENAME_LENGTH:
+        return file_name
+    stem, suffix = os.path.splitext(file_name)
+    if len(suffix) + len(tag) >= MAX_FILENAME_LENGTH:
+        # An extension this long leaves no room for the stem, so it is
+        # truncated along with it.
+        stem, suffix = file_name, ""
+    return stem[: MAX_FILENAME_LENGTH - len(tag) - len(suffix)] + tag + suffix
 
 
 if __name__ == "__main__":